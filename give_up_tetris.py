@@ -10,6 +10,10 @@ from src.network.PairSocket import PS
 def main_loop(screen: pygame.Surface, name: str, fps: int = 60) -> None:
     socket: PS | None = None
 
+    # 쓰지 않는 이벤트는 큐에 넣지 않는다.
+    pygame.event.set_blocked(None)
+    pygame.event.set_allowed([pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.QUIT])
+
     while True:
         if socket is None:
             lobby = LobbyInterface(name)
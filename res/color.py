@@ -23,3 +23,9 @@ class Color(Enum):
         6: (255, 127, 255),
         7: (127, 255, 255),
     }
+
+
+# 블록 색상 구분자로 바로 인덱싱할 수 있는 팔레트 (0은 빈 칸)
+block_colors: tuple[tuple[int, int, int] | None, ...] = tuple(
+    Color.blocks.value.get(i) for i in range(max(Color.blocks.value) + 1)
+)
@@ -3,4 +3,42 @@ import os
 
 pygame.init()
 
-fonts = [pygame.font.Font(os.path.dirname(os.path.abspath(__file__)) + "/D2Coding-Ver1.3.2-20180524.ttf", 6 * i) for i in range(10)]
+font_path = os.path.dirname(os.path.abspath(__file__)) + "/D2Coding-Ver1.3.2-20180524.ttf"
+fonts: dict[int, pygame.font.Font] = {}  # 불러온 폰트 캐시
+
+
+def font(font_size: int) -> pygame.font.Font:
+    """
+    폰트를 반환한다. 처음 쓰이는 크기일 때만 폰트 파일을 불러온다.
+    :param font_size: 폰트 크기 번호 (실제 크기는 6배)
+    :return: 폰트 객체
+    """
+    f = fonts.get(font_size)
+    if f is None:
+        f = pygame.font.Font(font_path, 6 * font_size)
+        fonts[font_size] = f
+    return f
+
+
+text_cache: dict[tuple[int, str, tuple[int, int, int]], pygame.Surface] = {}  # 렌더링된 텍스트 캐시
+text_cache_size = 256
+
+
+def render(font_size: int, content: str, color: tuple[int, int, int]) -> pygame.Surface:
+    """
+    텍스트를 렌더링한다. 같은 텍스트는 다시 렌더링하지 않는다.
+    :param font_size: 폰트 크기 번호
+    :param content: 텍스트 내용
+    :param color: 글자 색
+    :return: 텍스트가 그려진 표면
+    """
+    key = (font_size, content, color)
+    text = text_cache.get(key)
+    if text is None:
+        if len(text_cache) >= text_cache_size:
+            text_cache.clear()
+        text = font(font_size).render(content, True, color)
+        if pygame.display.get_surface() is not None:
+            text = text.convert_alpha()
+        text_cache[key] = text
+    return text
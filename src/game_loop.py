@@ -1,11 +1,15 @@
+from time import monotonic_ns
+
 import pygame
 
-from res.color import Color
-from res.font.font import fonts
+from res.color import Color, block_colors
+from res.font.font import render
 from src.module.Tetris import TetrisMap
 from src.module.TetrisInterface import TI
+from src.util.pacing import wait_frame
 
 keys = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE)
+events = (pygame.QUIT, pygame.KEYDOWN)
 
 
 def game_loop(screen: pygame.Surface, interface: TI, fps: int = 60) -> None:
@@ -15,85 +19,144 @@ def game_loop(screen: pygame.Surface, interface: TI, fps: int = 60) -> None:
     :param interface: TetrisInterface 객체
     :param fps: 주사율
     """
-    clock = pygame.time.Clock()
+    frame_ns = 10 ** 9 // fps
     width, height = screen.get_width(), screen.get_height()
     unit = height // TetrisMap.height
 
     done = False
-    
+
+    # 셀 영역 미리 만들기
+    cell_rects = [
+        [pygame.Rect(j * unit, i * unit, unit, unit) for j in range(TetrisMap.width)]
+        for i in range(TetrisMap.height)
+    ]
+    edge_rects = [
+        [pygame.Rect(j * unit - 2, i * unit - 2, unit + 4, unit + 4) for j in range(TetrisMap.width)]
+        for i in range(TetrisMap.height)
+    ]
+    name, opposite = interface.get_name(), interface.get_opposite()
+    edge_sources = ((Color.my_egde.value, name), (Color.peer_edge.value, opposite))
+
+    # 게임판 표면 (바뀐 칸만 다시 그린다)
+    board_surf = pygame.Surface((unit * TetrisMap.width, unit * TetrisMap.height)).convert()
+    board_surf.fill(Color.black.value)
+    board_surf.set_colorkey(Color.black.value)
+    board_map = [[0] * TetrisMap.width for _ in range(TetrisMap.height)]
+
+    # 대기 블록 표면 (대기 큐가 바뀔 때만 다시 그린다)
+    queue_surf = pygame.Surface((unit * 5 * 3, unit * 4)).convert()
+    queue_surf_queue: list | None = None
+
+    # 이전 프레임 상태 (바뀐 영역만 화면에 반영하기 위함)
+    panel_rect = pygame.Rect(unit * (TetrisMap.width + 1), 0, width - unit * (TetrisMap.width + 1), height)
+    first_frame = True
+    prev_pos: list[list[tuple[int, int]]] = [[], []]
+    prev_panel: tuple | None = None
+
+    # 반복문 안에서 쓰는 값들
+    blit = screen.blit
+    fill = screen.fill
+    board_fill = board_surf.fill
+    draw_rect = pygame.draw.rect
+    black, white, lightgrey = Color.black.value, Color.white.value, Color.lightgrey.value
+    text_x = unit * (TetrisMap.width + 3)
+    key_to_action = {
+        keys[0]: interface.move_left,
+        keys[1]: interface.move_right,
+        keys[2]: interface.rotate,
+        keys[3]: interface.move_down,
+        keys[4]: interface.superdown,
+    }
+
     interface.start()
+    state = interface.get_state()
+    next_tick = monotonic_ns() + frame_ns
 
     while not done:
-        for event in pygame.event.get():
-            if event.type == pygame.KEYDOWN:
-                if event.key == keys[0]:
-                    interface.move_left()
-                if event.key == keys[1]:
-                    interface.move_right()
-                if event.key == keys[2]:
-                    interface.rotate()
-                if event.key == keys[3]:
-                    interface.move_down()
-                if event.key == keys[4]:
-                    interface.superdown()
-                if event.key == pygame.K_RETURN and interface.get_state() == 2:
-                    done = True
+        for event in pygame.event.get(events):
+            match event.type:
+                case pygame.QUIT:
+                    quit()
+                case pygame.KEYDOWN:
+                    action = key_to_action.get(event.key)
+                    if action is not None:
+                        action()
+                    elif event.key == pygame.K_RETURN and state == 2:
+                        done = True
+        pygame.event.clear(pump=False)
 
         interface.update()
+        state = interface.get_state()
+        score = interface.get_score()
+        tetris_map = interface.get_map()
+        queue = interface.get_queue()[:3]
 
-        screen.fill(Color.black.value)
+        fill(black)
 
-        pygame.draw.rect(screen, Color.white.value, (0, 0, unit * 10, unit * 30), 1)
-        for color, pos in [
-            (Color.my_egde.value, interface.get_position(interface.get_name())),
-            (Color.peer_edge.value, interface.get_position(interface.get_opposite()))
-        ]:
+        draw_rect(screen, white, (0, 0, unit * 10, unit * 30), 1)
+        positions = []
+        for edge_color, player in edge_sources:
+            pos = list(interface.get_position(player))
             for i, j in pos:
-                pygame.draw.rect(screen, color, (j * unit - 2, i * unit - 2, unit + 4, unit + 4))
-
-        tetris_map = interface.get_map()
-        for i in range(len(tetris_map)):
-            for j in range(len(tetris_map[i])):
-                if tetris_map[i][j]:
-                    pygame.draw.rect(
-                        screen,
-                        Color.blocks.value[tetris_map[i][j]],
-                        (j * unit, i * unit, unit, unit)
-                    )
+                fill(edge_color, edge_rects[i][j])
+            positions.append(pos)
+
+        dirty_rects: list[pygame.Rect] = []
+        for row, board_row, rects in zip(tetris_map, board_map, cell_rects):
+            if row == board_row:
+                continue
+            for j, (value, rect) in enumerate(zip(row, rects)):
+                if value != board_row[j]:
+                    board_fill(block_colors[value] or black, rect)
+                    board_row[j] = value
+                    dirty_rects.append(rect)
+        blit(board_surf, (0, 0))
 
         offset = height // 2 - 30
         for index, (content, font_size) in enumerate([
-            ("Peer: " + interface.get_opposite(), 4),
-            ("Score: " + str(interface.get_score()), 5),
+            ("Peer: " + opposite, 4),
+            ("Score: " + str(score), 5),
             ("Game Over", 6),
             ("Press enter to exit.", 4),
         ]):
-            if interface.get_state() != 2 and 2 <= index:
+            if state != 2 and 2 <= index:
                 break
-            text = fonts[font_size].render(content, True, Color.white.value)
-            screen.blit(
-                text,
-                (unit * (TetrisMap.width + 3), offset)
-            )
+            text = render(font_size, content, white)
+            blit(text, (text_x, offset))
             offset += text.get_height() + 10
 
-        offset = TetrisMap.width + 1
-        for index, block in enumerate(interface.get_queue()[:3]):
-            last = 0
-            for i in range(5):
-                for j in range(5):
-                    if j < len(block) and i < len(block[j]) and block[j][i]:
-                        last = i
-                        pygame.draw.rect(
-                            screen,
-                            Color.lightgrey.value,
-                            ((offset + i) * unit, (1 + j) * unit, unit, unit)
-                        )
-            offset += last + 2
-
-        pygame.display.update()
-
-        clock.tick(fps)
+        if queue != queue_surf_queue:
+            queue_surf_queue = queue
+            queue_surf.fill(black)
+            offset = 0
+            for block in queue:
+                last = 0
+                for j, row in enumerate(block):
+                    y = j * unit
+                    for i, value in enumerate(row):
+                        if value:
+                            last = max(last, i)
+                            queue_surf.fill(lightgrey, ((offset + i) * unit, y, unit, unit))
+                offset += last + 2
+        blit(queue_surf, (unit * (TetrisMap.width + 1), unit))
+
+        # 바뀐 영역 계산
+        panel = (score, state, queue)
+        if first_frame:
+            first_frame = False
+            pygame.display.update()
+        else:
+            for pos, pre in zip(positions, prev_pos):
+                if pos != pre:
+                    dirty_rects.extend(edge_rects[i][j] for i, j in pos + pre)
+            if panel != prev_panel:
+                dirty_rects.append(panel_rect)
+            if dirty_rects:
+                pygame.display.update(dirty_rects)
+        prev_pos = positions
+        prev_panel = panel
+
+        next_tick = wait_frame(next_tick, frame_ns)
 
 
 if __name__ == "__main__":
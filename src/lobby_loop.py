@@ -1,5 +1,5 @@
-from threading import Semaphore
-from typing import Callable
+from queue import Queue, Empty
+from time import monotonic_ns
 
 import pygame
 
@@ -7,29 +7,59 @@ from res.color import Color
 from res.string import String
 from src.module.LobbyInterface import LobbyInterface
 from src.util.keymap import keymap
+from src.util.pacing import wait_frame
 from src.view.Alignment import Alignment
 from src.view.Button import EdgeButton
 from src.view.TextHolder import TextHolder
 from src.view.widget import Drawable, Clickable
-from res.font.font import fonts
+from res.font.font import font, render
+
+events = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN)
 
 
 def lobby_loop(screen: pygame.Surface, interface: LobbyInterface, fps: int = 60):
-    clock = pygame.time.Clock()
+    frame_ns = 10 ** 9 // fps
     width, height = screen.get_width(), screen.get_height()
 
     # 상태
     scanning = False
     connecting = False
     selected_ip: str | None = None
+    scan_results: Queue[list[tuple[str, str]]] = Queue()  # 스캔 스레드가 결과를 넘겨준다.
 
     # 위젯
     chat_holder: TextHolder
     ready_btn: EdgeButton
     scan_btn: EdgeButton
     connect_btn: EdgeButton
-    server_btn_list: list[EdgeButton] = []
-    
+
+    # 서버 목록 (한 장의 표면에 모아 그린다)
+    server_list: list[tuple[str, str]] = []  # 이름, IP
+    server_rows: list[pygame.Rect] = []  # 표면 안에서의 각 줄 영역
+    server_panel_surf: pygame.Surface | None = None
+    server_panel_pos = (0, 100)
+
+    def draw_server_row(index: int) -> None:
+        name, ip = server_list[index]
+        rect = server_rows[index]
+        color = Color.green.value if ip == selected_ip else Color.white.value
+        server_panel_surf.fill(Color.black.value, rect)
+        pygame.draw.rect(server_panel_surf, color, rect.inflate(-10, -10), 1)
+        text = render(3, name + ": " + ip, color)
+        server_panel_surf.blit(text, text.get_rect(center=rect.center))
+
+    def set_server_list(new_list: list[tuple[str, str]]) -> None:
+        nonlocal server_list, server_rows, server_panel_surf, selected_ip
+        selected_ip = None
+        server_list = new_list
+        server_rows = [pygame.Rect(0, 50 * index, width // 2, 50) for index in range(len(server_list))]
+        if not server_list:
+            server_panel_surf = None
+            return
+        server_panel_surf = pygame.Surface((width // 2, 50 * len(server_list))).convert()
+        for index in range(len(server_list)):
+            draw_server_row(index)
+
     # 콜백
     def toggle_ready() -> None:
         if interface.get_opposite() is None:
@@ -44,32 +74,40 @@ def lobby_loop(screen: pygame.Surface, interface: LobbyInterface, fps: int = 60)
         nonlocal scanning
         if scanning:
             return
-        sem = Semaphore()
-        sem.acquire()
         scanning = True
-        interface.scan_server(sem)
-        sem.acquire()
         scan_btn.text = String.scanning.value + "..."
         scan_btn.color = Color.lightgrey.value
+        interface.scan_server(on_complete=scan_results.put)
+
+    def select_server(mouse: tuple[int, int]) -> None:
+        nonlocal selected_ip
+        point = (mouse[0] - server_panel_pos[0], mouse[1] - server_panel_pos[1])
+        for index, rect in enumerate(server_rows):
+            if not rect.collidepoint(point):
+                continue
+            ip = server_list[index][1]
+            pre_ip = selected_ip
+            selected_ip = None if ip == selected_ip else ip
+            for i, (_, row_ip) in enumerate(server_list):
+                if row_ip in (pre_ip, ip):
+                    draw_server_row(i)
+            return
 
     def connect() -> None:
         nonlocal connecting
-        if selected_ip is None:
+        if connecting or selected_ip is None:
             return
-        sem = Semaphore()
-        sem.acquire()
         connecting = True
-        interface.connect_server(selected_ip, sem)
-        sem.acquire()
         connect_btn.text = String.connecting.value + "..."
         connect_btn.color = Color.lightgrey.value
+        interface.connect_server(selected_ip)
 
     # 선언
     chat_holder = TextHolder(
         (width // 2, height - 250),
         (width // 2, 50),
         Color.white.value,
-        fonts[3],
+        font(3),
         align=Alignment.middle_left,
     )
 
@@ -78,7 +116,7 @@ def lobby_loop(screen: pygame.Surface, interface: LobbyInterface, fps: int = 60)
         (width // 2, 100),
         toggle_ready,
         String.ready.value,
-        fonts[4],
+        font(4),
         Color.white.value,
         3,
     )
@@ -88,7 +126,7 @@ def lobby_loop(screen: pygame.Surface, interface: LobbyInterface, fps: int = 60)
         (width // 2, 100),
         scan,
         String.scan.value,
-        fonts[4],
+        font(4),
         Color.white.value,
         3,
     )
@@ -98,115 +136,128 @@ def lobby_loop(screen: pygame.Surface, interface: LobbyInterface, fps: int = 60)
         (width // 2, 100),
         connect,
         String.connect.value,
-        fonts[4],
+        font(4),
         Color.white.value,
         3,
     )
 
+    # 화면 영역 (바뀐 영역만 화면에 반영하기 위함)
+    regions = [
+        pygame.Rect(0, 0, width // 2, height),  # 스캔, 서버 목록, 연결 버튼
+        pygame.Rect(width // 2, 0, width // 2, 350),  # 채팅 목록
+        pygame.Rect(width // 2, 350, width // 2, height - 350),  # 채팅 입력, 이름, 준비 버튼
+    ]
+    prev_signatures: list[tuple] | None = None
+
+    # 채팅 목록 표면 (채팅이 바뀔 때만 다시 그린다)
+    chat_panel_surf = pygame.Surface((width // 2 - 11, 339)).convert()
+    chat_panel_tail: list[tuple[str, str]] | None = None
+
     chat_holder.activate()
     ready_btn.activate()
     scan_btn.activate()
     connect_btn.activate()
 
     interface.start()
+    next_tick = monotonic_ns() + frame_ns
 
     while not interface.check_ready():
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                quit()
-            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                Clickable.spread_click(pygame.mouse.get_pos())
-            if event.type == pygame.KEYDOWN:
-                if event.key in keymap:
-                    chat_holder.value += keymap[event.key]
-                if event.key == pygame.K_BACKSPACE and len(chat_holder.value) > 0:
-                    chat_holder.value = chat_holder.value[:-1]
-                if event.key == pygame.K_RETURN:
-                    interface.send_chat(chat_holder.value)
-                    chat_holder.value = ""
-
-        if scanning and not interface.is_scanning():
-            scanning = False
-            selected_ip = None
-            scan_btn.text = String.scan.value
-            scan_btn.color = Color.white.value
-            for server_btn in server_btn_list:
-                server_btn.kill()
-            server_btn_list = []
-            for index, (name, ip) in enumerate(interface.get_serverlist()):
-
-                def callback(index: int, ip: str) -> Callable[[], None]:
-                    def f() -> None:
-                        nonlocal selected_ip
-                        if ip == selected_ip:
-                            selected_ip = None
-                            server_btn_list[index].color = Color.white.value
-                        else:
-                            selected_ip = ip
-                            server_btn_list[index].color = Color.green.value
-
-                    return f
-
-                server_btn_list.append(EdgeButton(
-                    (0, 100 + 50 * index),
-                    (width // 2, 50),
-                    callback(index, ip),
-                    name + ": " + ip,
-                    fonts[3],
-                    Color.white.value,
-                    5,
-                    1,
-                ))
-                server_btn_list[-1].activate()
+        for event in pygame.event.get(events):
+            match event.type:
+                case pygame.QUIT:
+                    quit()
+                case pygame.MOUSEBUTTONDOWN if event.button == 1:
+                    Clickable.spread_click(pygame.mouse.get_pos())
+                    select_server(pygame.mouse.get_pos())
+                case pygame.KEYDOWN:
+                    match event.key:
+                        case pygame.K_BACKSPACE:
+                            chat_holder.value = chat_holder.value[:-1]
+                        case pygame.K_RETURN:
+                            interface.send_chat(chat_holder.value)
+                            chat_holder.value = ""
+                        case key if key in keymap:
+                            chat_holder.value += keymap[key]
+        pygame.event.clear(pump=False)
+
+        if scanning:
+            try:
+                new_list = scan_results.get_nowait()
+            except Empty:
+                pass
+            else:
+                scanning = False
+                scan_btn.text = String.scan.value
+                scan_btn.color = Color.white.value
+                set_server_list(new_list)
 
         if connecting and not interface.is_connecting():
             connecting = False
             connect_btn.text = String.connect.value
             connect_btn.color = Color.white.value
             if interface.get_opposite() is None:
-                for server_btn in server_btn_list:
-                    server_btn.kill()
-                server_btn_list = []
+                set_server_list([])
 
         if not interface.is_connected():
             ready_btn.color = Color.white.value
 
+        opposite = interface.get_opposite()
+        if opposite is None:
+            opposite = "Peer is not connected."
+        else:
+            opposite = "peer: " + opposite
+        chat_tail = interface.get_chatlist()[-10:]
+
+        # 화면에 보이는 상태가 그대로면 다시 그리지 않는다.
+        signatures = [
+            (
+                scan_btn.text, scan_btn.color, connect_btn.text, connect_btn.color,
+                tuple(server_list), selected_ip,
+            ),
+            tuple(chat_tail),
+            (chat_holder.value, opposite, ready_btn.color),
+        ]
+        if signatures == prev_signatures:
+            next_tick = wait_frame(next_tick, frame_ns)
+            continue
+
         screen.fill((0, 0, 0))
         Drawable.spread_draw(screen)
+        if server_panel_surf is not None:
+            screen.blit(server_panel_surf, server_panel_pos)
 
         screen.blit(
-            fonts[3].render("me: " + interface.get_name(), True, Color.white.value),
+            render(3, "me: " + interface.get_name(), Color.white.value),
             (width // 2, height - 170)
         )
-        opposite = interface.get_opposite()
-        if opposite is None:
-            opposite = "Peer is not connected."
-        else:
-            opposite = "peer: " + opposite
         screen.blit(
-            fonts[3].render(opposite, True, Color.white.value),
+            render(3, opposite, Color.white.value),
             (width // 2, height - 140)
         )
 
-        text_high = 10
-        for index, (name, chat) in enumerate(interface.get_chatlist()[-10:]):
-            text = fonts[3].render(name + ": " + chat, True, Color.white.value)
-            screen.blit(
-                text,
-                (width // 2 + 10, text_high)
-            )
-            text_high += text.get_height() + 10
+        if chat_tail != chat_panel_tail:
+            chat_panel_tail = chat_tail
+            chat_panel_surf.fill(Color.black.value)
+            text_high = 0
+            for name, chat in chat_tail:
+                text = render(3, name + ": " + chat, Color.white.value)
+                chat_panel_surf.blit(text, (0, text_high))
+                text_high += text.get_height() + 10
+        screen.blit(chat_panel_surf, (width // 2 + 10, 10))
         pygame.draw.rect(screen, Color.white.value, (width // 2, 0, width // 2, 350), 1)
 
-        pygame.display.update()
+        if prev_signatures is None:
+            pygame.display.update()
+        else:
+            dirty_rects = [rect for rect, sig, pre in zip(regions, signatures, prev_signatures) if sig != pre]
+            pygame.display.update(dirty_rects)
+        prev_signatures = signatures
 
-        clock.tick(fps)
+        next_tick = wait_frame(next_tick, frame_ns)
 
     ready_btn.kill()
     connect_btn.kill()
     scan_btn.kill()
-    for server_btn in server_btn_list:
-        server_btn.kill()
 
 
 if __name__ == "__main__":
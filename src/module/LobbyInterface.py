@@ -1,10 +1,10 @@
 from src.network.PairSocket import PS, PairServerSocket, PairClientSocket, Message, PairSocket
 from src.network.protocol import tetris_port, TetrisMessageType as Tmt
 from src.network.ServerScanner import ServerScanner
-from typing import Final
 from threading import Lock
 from collections import deque
 from threading import Semaphore
+from typing import Callable
 
 
 class LobbyInterface:
@@ -17,8 +17,7 @@ class LobbyInterface:
             self.__name = socket_or_name.get_name()
         self.__lock = Lock()
         self.__is_server = isinstance(self.__socket, PairServerSocket)
-        self.__chat_bufsize: Final[int] = chat_bufsize
-        self.__chatlist: deque[tuple[str, str]] = deque()
+        self.__chatlist: deque[tuple[str, str]] = deque(maxlen=chat_bufsize)
         self.__ready = False
         self.__opposite_ready = False
         self.__scanner = ServerScanner()
@@ -27,8 +26,13 @@ class LobbyInterface:
     def start(self) -> None:
         self.__socket.start("0.0.0.0", tetris_port)
 
-    def scan_server(self, sem: Semaphore | None = None) -> None:
-        self.__scanner.scan(tetris_port, sem)
+    def scan_server(self,
+                    sem: Semaphore | None = None,
+                    on_complete: Callable[[list[tuple[str, str]]], None] | None = None) -> None:
+        if on_complete is None:
+            self.__scanner.scan(tetris_port, sem)
+        else:
+            self.__scanner.scan(tetris_port, sem, lambda serverlist: on_complete(self.__filter_serverlist(serverlist)))
 
     def is_scanning(self) -> bool:
         return self.__scanner.is_scanning()
@@ -37,6 +41,9 @@ class LobbyInterface:
         serverlist = self.__scanner.get_server_list()
         if serverlist is None:
             return None
+        return self.__filter_serverlist(serverlist)
+
+    def __filter_serverlist(self, serverlist: list[tuple[str, int, str]]) -> list[tuple[str, str]]:
         result = []
         for ip, port, name in serverlist:
             if name != self.__name:
@@ -106,22 +113,21 @@ class LobbyInterface:
     def __add_chat(self, name: str, chat: str) -> None:
         with self.__lock:
             self.__chatlist.append((name, chat))
-            if len(self.__chatlist) > self.__chat_bufsize:
-                self.__chatlist.popleft()
 
     def __set_socket(self) -> None:
         def recv_chat(msg: Message) -> Message:
             self.__add_chat(self.__socket.get_opposite(), msg[1])
             return Tmt.chat_r, None
 
-        def ready_or_not(msg: Message) -> Message:
+        def on_ready(msg: Message) -> Message:
             with self.__lock:
-                if msg[0] == Tmt.ready:
-                    self.__opposite_ready = True
-                    return Tmt.ready_r, None
-                if msg[0] == Tmt.busy:
-                    self.__opposite_ready = False
-                    return Tmt.busy_r, None
+                self.__opposite_ready = True
+            return Tmt.ready_r, None
+
+        def on_busy(msg: Message) -> Message:
+            with self.__lock:
+                self.__opposite_ready = False
+            return Tmt.busy_r, None
 
         if not self.__is_server:
             def not_ready(msg: Message) -> Message:
@@ -130,5 +136,5 @@ class LobbyInterface:
             self.__socket.enroll(Tmt.mdchngd, not_ready)
 
         self.__socket.enroll(Tmt.chat, recv_chat)
-        self.__socket.enroll(Tmt.ready, ready_or_not)
-        self.__socket.enroll(Tmt.busy, ready_or_not)
+        self.__socket.enroll(Tmt.ready, on_ready)
+        self.__socket.enroll(Tmt.busy, on_busy)
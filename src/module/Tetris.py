@@ -1,6 +1,4 @@
 from collections import deque
-from copy import deepcopy
-from math import cos, sin, pi
 from random import randrange, shuffle
 from time import monotonic_ns
 from typing import Final
@@ -17,6 +15,7 @@ class Tetris:
         self.__players = { player: key for key, player in enumerate(player_list) }
         self.__tetris = TetrisMap(list(self.__players.values()), 3)
         self.__downgap_ns = 1 * 10 ** 9
+        self.__next_update_ns = 0  # 이 시각 전에는 내려갈 블록이 없다.
         self.__score = 0
         self.__started = False
         self.__ended = False
@@ -28,8 +27,11 @@ class Tetris:
         if not self.__started or self.__ended:
             return
         # 내려갈 시간이 된 블록 내리기
+        now = monotonic_ns()
+        if now < self.__next_update_ns:
+            return
         for key in self.__players.values():
-            if self.__tetris.get_hangtime(key) < self.__downgap_ns:
+            if self.__tetris.get_hangtime(key, now) < self.__downgap_ns:
                 continue
             err = self.__tetris.move_block(key, 1)
             if err in (1, 3):
@@ -40,6 +42,16 @@ class Tetris:
                 self.__score += 100 * line
         # 내려가는 시간 조절
         self.__downgap_ns = round(1000 * 10 ** 9 / (1000 + self.__score))
+        # 블록을 움직이면 체공 시간이 다시 시작되므로 이 시각은 늦춰질 뿐 앞당겨지지 않는다.
+        hangtime = max(self.__tetris.get_hangtime(key, now) for key in self.__players.values())
+        self.__next_update_ns = now + self.__downgap_ns - hangtime
+
+    def get_next_update_ns(self) -> int:
+        """
+        update가 다음에 할 일이 생길 수 있는 시각을 반환한다.
+        :return: 나노초 단위의 시각이며, 이 시각 전에는 update를 불러도 아무 일도 일어나지 않는다.
+        """
+        return self.__next_update_ns
 
     def start(self) -> None:
         """
@@ -72,6 +84,13 @@ class Tetris:
         """
         return self.__tetris.get_map()
 
+    def get_map_packed(self) -> bytes:
+        """
+        게임 맵 상태를 한 칸당 1바이트로 얻어온다.
+        :return: 행 우선 순서로 나열된 칸의 색상이다.
+        """
+        return self.__tetris.get_map_packed()
+
     def get_score(self) -> int:
         """
         현재 점수를 얻는다.
@@ -79,14 +98,21 @@ class Tetris:
         """
         return self.__score
 
-    def get_queue(self) -> list[Matrix]:
+    def get_queue(self) -> list[Form]:
         """
         현재 대기 큐 상태를 얻는다.
         :return: 블록을 표현하는 행렬을 담은 리스트이다.
         """
         return self.__tetris.get_queue()
 
-    def get_position(self, player: str) -> list[Point]:
+    def get_queue_packed(self) -> bytes:
+        """
+        현재 대기 큐 상태를 색상 구분자로 얻는다.
+        :return: 한 블록당 1바이트인 색상 구분자이다.
+        """
+        return self.__tetris.get_queue_packed()
+
+    def get_position(self, player: str) -> tuple[Point, ...]:
         """
         현재 플레이어가 조종하고 있는 블록의 위치를 얻는다.
         :param player: 플레이어 이름
@@ -135,6 +161,7 @@ class Tetris:
                 self.end()
                 return
             self.__score += 100 * line
+            self.__next_update_ns = 0  # 점수가 바뀌면 내려가는 시간도 바뀐다.
 
     def rotate(self, player: str) -> None:
         """
@@ -150,34 +177,56 @@ class TetrisMap:
     height: Final[int] = 30
     spawn_height: Final[int] = 6
     width: Final[int] = 10
+    full_row: Final[int] = (1 << width) - 1  # 꽉 찬 줄의 비트마스크
+    directions: Final[tuple[Point, ...]] = ((0, 1), (1, 0), (0, -1), (-1, 0))  # 오른쪽, 아래, 왼쪽, 위
 
     def __init__(self, key_list: list[int], min_queue_size: int):
         """
         테트리스 게임 판
-        :param key_list: 풀레이어 구분자 리스트
+        :param key_list: 풀레이어 구분자 리스트 (구분자는 블록 목록의 인덱스로 쓰이는 0 이상의 정수)
         :param min_queue_size: 블록 대기 큐의 최소 사이즈
         """
         self.min_queue_size: Final[int] = min_queue_size
-        self.__map: Matrix = [[0] * TetrisMap.width for _ in range(TetrisMap.height)]  # 게임판
-        self.__moving_blocks: dict[int, TetrisBlock | None] = { key: None for key in key_list }  # 현재 움직이고 있는 블록
-        self.__queue: deque[TetrisBlock] = deque()  # 블록 대기열
+        self.__map = bytearray(TetrisMap.height * TetrisMap.width)  # 게임판 (x * width + y 번째 칸)
+        self.__row_mask: list[int] = [0] * TetrisMap.height  # 줄마다 채워진 칸의 비트마스크
+        self.__moving_blocks: list[TetrisBlock | None] = [None] * (max(key_list) + 1)  # 현재 움직이고 있는 블록
+        self.__drop_time: list[int] = [0] * (max(key_list) + 1)  # 움직이는 블록이 마지막으로 내려온(생긴) 시각
+        self.__multi: Final[bool] = len(key_list) > 1  # 혼자면 다른 플레이어의 블록을 확인하지 않는다.
+        self.__queue: deque[int] = deque()  # 블록 대기열 (블록은 꺼낼 때 만들기 위해 색상 구분자만 둔다)
+        self.__map_cache: bytes | None = None  # 마지막으로 만든 get_map_packed 결과 (판이 바뀌면 None)
+        self.__rows_cache: tuple[bytes, Matrix] | None = None  # 마지막으로 풀어 둔 (압축 게임판, get_map 결과)
         for key in key_list:
             self.fix_remove_pop(key)
 
     def get_map(self) -> Matrix:
         """
         현재 게임판 상태를 반환한다.
+        판이 바뀌지 않았으면 이전에 만든 리스트를 그대로 돌려주므로 반환값을 수정하면 안 된다.
         :return: int 자료형의 2차원 리스트이다.
         """
-        result = deepcopy(self.__map)
-        for key, block in self.__moving_blocks.items():
+        packed = self.get_map_packed()
+        if self.__rows_cache is None or self.__rows_cache[0] is not packed:
+            self.__rows_cache = (packed, unpack_map(packed))
+        return self.__rows_cache[1]
+
+    def get_map_packed(self) -> bytes:
+        """
+        현재 게임판 상태를 한 칸당 1바이트로 반환한다.
+        :return: 행 우선 순서로 x * width + y 번째 바이트가 (x, y) 칸의 색상인 bytes
+        """
+        if self.__map_cache is not None:
+            return self.__map_cache
+        width = TetrisMap.width
+        board = self.__map[:]
+        for block in self.__moving_blocks:
             if block is None:
                 continue
             for x, y in block.get_position():
-                result[x][y] = block.color
-        return result
+                board[x * width + y] = block.color
+        self.__map_cache = bytes(board)
+        return self.__map_cache
 
-    def get_position(self, key: int) -> list[Point]:
+    def get_position(self, key: int) -> tuple[Point, ...]:
         """
         현재 판에서 플레이어가 조종 중인 블록의 위치를 반환한다.
         :param key: 플레이어 식별자
@@ -185,20 +234,31 @@ class TetrisMap:
         """
         return self.__moving_blocks[key].get_position()
 
-    def get_hangtime(self, key: int) -> int:
+    def get_hangtime(self, key: int, now: int | None = None) -> int:
         """
         플레이어가 조종 중인 블록의 현재 체공 유지 시간을 반환한다.
         :param key: 플레이어 식별자
+        :param now: 나노초 단위의 현재 시각 (없으면 새로 잰다)
         :return: 나노초 단위의 체공 유지 시간이다.
         """
-        return monotonic_ns() - self.__moving_blocks[key].created_time
+        if now is None:
+            now = monotonic_ns()
+        return now - self.__drop_time[key]
 
-    def get_queue(self) -> list[Matrix]:
+    def get_queue(self) -> list[Form]:
         """
         블록 대기 큐에 있는 블록 현황을 반환한다.
         :return: 블록을 나타내는 행렬을 담은 리스트이다.
         """
-        return list(map(lambda b: deepcopy(b.form), self.__queue))
+        rotations = TetrisBlock.rotations
+        return [rotations[color][0] for color in self.__queue]
+
+    def get_queue_packed(self) -> bytes:
+        """
+        블록 대기 큐에 있는 블록들의 색상 구분자를 반환한다.
+        :return: 한 블록당 1바이트인 bytes
+        """
+        return bytes(self.__queue)
 
     def fix_remove_pop(self, key: int) -> int | None:
         """
@@ -206,26 +266,34 @@ class TetrisMap:
         :param key: 플레이어 구분자
         :return: 정상적으로 종료되면 사라진 줄의 개수를, 그렇지 않으면 None을 반환한다.
         """
-        if self.__moving_blocks[key] is not None:
-            for x, y in self.__moving_blocks[key].get_position():
-                self.__map[x][y] = self.__moving_blocks[key].color
-        removed = 0
-        for i in range(TetrisMap.height):
-            if all(self.__map[i]):
-                self.__map.pop(i)
-                self.__map.insert(0, [0] * TetrisMap.width)
-                removed += 1
+        self.__map_cache = None
+        height, width, full_row = TetrisMap.height, TetrisMap.width, TetrisMap.full_row
+        fixed = self.__moving_blocks[key]
+        if fixed is not None:
+            board, row_mask, color = self.__map, self.__row_mask, fixed.color
+            for x, y in fixed.get_position():
+                board[x * width + y] = color
+                row_mask[x] |= 1 << y
+        kept = [i for i, mask in enumerate(self.__row_mask) if mask != full_row]
+        removed = height - len(kept)
+        if removed:
+            board = bytearray(removed * width)
+            for i in kept:
+                board += self.__map[i * width:(i + 1) * width]
+            self.__map = board
+            self.__row_mask = [0] * removed + [self.__row_mask[i] for i in kept]
         while len(self.__queue) <= self.min_queue_size:
             bag = list(range(1, 8))
             shuffle(bag)
-            self.__queue.extend(map(lambda i: TetrisBlock((0, 0), i), bag))
-        block = self.__queue.popleft()
-        spot = list(range(TetrisMap.width))
+            self.__queue.extend(bag)
+        block = TetrisBlock((0, 0), self.__queue.popleft())
+        spawn_height = TetrisMap.spawn_height
+        spot = list(range(width))
         shuffle(spot)
         for s in spot:
-            new_block = block.move((TetrisMap.spawn_height, s))
-            if self.__confirm_block(key, new_block) == 0:
-                self.__moving_blocks[key] = new_block.copy()
+            if self.__confirm_block(key, block, (spawn_height, s)) == 0:
+                self.__moving_blocks[key] = block.move((spawn_height, s))
+                self.__drop_time[key] = monotonic_ns()
                 return removed
         return None
 
@@ -237,13 +305,15 @@ class TetrisMap:
         :return: 블록 회전에 성공하면 True, 그렇지 않으면 False를 반환한다.
         """
         new_block = self.__moving_blocks[key].rotate(clockwise)
-        if self.__confirm_block(key, new_block) == 0:
+        confirm_block = self.__confirm_block
+        if confirm_block(key, new_block) == 0:
             self.__moving_blocks[key] = new_block
+            self.__map_cache = None
             return True
         for mov in zip((1, 1, 1, 0, 0, -1, -1, -1), (-1, 0, 1, -1, 1, -1, 0, 1)):
-            mov_block = new_block.move(mov)
-            if self.__confirm_block(key, mov_block) == 0:
-                self.__moving_blocks[key] = mov_block
+            if confirm_block(key, new_block, mov) == 0:
+                self.__moving_blocks[key] = new_block.move(mov)
+                self.__map_cache = None
                 return True
         return False
 
@@ -254,13 +324,14 @@ class TetrisMap:
         :param mov: 블록을 움직이는 정도를 표현하는 수이다. 0은 오른쪽, 1은 아래, 2는 왼쪽, 3은 위
         :return: 성공은 0, 맵 이탈에 의한 실패는 1, 다른 플레이어의 블록에 의한 실패는 2, 이미 놓은 블록에 의한 실패는 3을 반환한다.
         """
-        rad = mov * pi / 2
-        new_block = self.__moving_blocks[key].move((round(sin(rad)), round(cos(rad))))
-        if mov == 1:
-            new_block = new_block.copy()
-        confirm = self.__confirm_block(key, new_block)
+        block = self.__moving_blocks[key]
+        amount = TetrisMap.directions[mov]
+        confirm = self.__confirm_block(key, block, amount)
         if confirm == 0:
-            self.__moving_blocks[key] = new_block
+            self.__moving_blocks[key] = block.move(amount)
+            if mov == 1:
+                self.__drop_time[key] = monotonic_ns()
+            self.__map_cache = None
         return confirm
 
     def superdown_block(self, key: int) -> int:
@@ -269,33 +340,120 @@ class TetrisMap:
         :param key: 플레이어 구분자
         :return: 맵 이탈에 의한 멈춤은 1, 다른 플레이어의 블록에 의한 멈춤은 2, 이미 놓은 블록에 의한 멈춤은 3을 반환한다.
         """
-        pre_block = self.__moving_blocks[key]
-        new_block = pre_block.move((1, 0))
-        confirm = self.__confirm_block(key, new_block)
-        while confirm == 0:
-            pre_block = new_block
-            new_block = new_block.move((1, 0))
-            confirm = self.__confirm_block(key, new_block)
-        self.__moving_blocks[key] = pre_block.copy()
-        return confirm
+        block = self.__moving_blocks[key]
+        height = TetrisMap.height
+        row_mask = self.__row_mask
+        positions = block.get_position()
+        # 맵 이탈, 다른 플레이어의 블록, 이미 놓인 블록 각각에 닿기 전까지 내려갈 수 있는 거리
+        bound_drop = height - 1 - max(x for x, _ in positions)
+        other_drop = height
+        if self.__multi:
+            for other_key, other in enumerate(self.__moving_blocks):
+                if other_key == key or other is None:
+                    continue
+                for ox, oy in other.get_position():
+                    for x, y in positions:
+                        if y == oy and x < ox:
+                            other_drop = min(other_drop, ox - x - 1)
+        placed_drop = height
+        for x, y in positions:
+            for r in range(x + 1, min(height, x + 1 + placed_drop)):
+                if row_mask[r] >> y & 1:
+                    placed_drop = r - x - 1
+                    break
+        drop = min(bound_drop, other_drop, placed_drop)
+        self.__moving_blocks[key] = block.move((drop, 0))
+        self.__drop_time[key] = monotonic_ns()
+        self.__map_cache = None
+        # 멈춘 이유는 __confirm_block과 같은 우선순위로 정한다.
+        if drop == bound_drop:
+            return 1
+        if drop == other_drop:
+            return 2
+        return 3
 
-    def __confirm_block(self, key: int, block: 'TetrisBlock') -> int:
+    def __confirm_block(self, key: int, block: 'TetrisBlock', amount: Point = (0, 0)) -> int:
         """
         현재 게임판 상태에서 주어진 블록이 위치할 수 있는지를 확인한다.
         :param key: 플레이어 구분자
         :param block: TetrisBlock 객체
+        :param amount: 블록을 옮겨서 확인할 벡터 (옮긴 블록을 새로 만들지 않기 위함)
         :return: 이상이 없으면 0, 맵 이탈은 1, 다른 플레이어의 블록과 겹치면 2, 이미 놓인 블록과 겹치면 3을 반환한다.
         """
-        if not all(map(lambda p: 0 <= p[0] < TetrisMap.height and 0 <= p[1] < TetrisMap.width, block.get_position())):
-            return 1
-        if any(map(lambda d: d[0] != key and d[1] is not None and block.collide(d[1]), self.__moving_blocks.items())):
-            return 2
-        if any(map(lambda p: self.__map[p[0]][p[1]] != 0, block.get_position())):
-            return 3
+        dx, dy = amount
+        height, width = TetrisMap.height, TetrisMap.width
+        positions = block.get_position()
+        # 반환값의 우선순위(1, 2, 3)를 지키기 위해 검사 순서를 유지한다.
+        for x, y in positions:
+            if not (0 <= x + dx < height and 0 <= y + dy < width):
+                return 1
+        if self.__multi:
+            for other_key, other in enumerate(self.__moving_blocks):
+                if other_key != key and other is not None and block.collide(other, amount):
+                    return 2
+        row_mask = self.__row_mask
+        for x, y in positions:
+            if row_mask[x + dx] >> (y + dy) & 1:
+                return 3
         return 0
 
 
+def unpack_map(packed: bytes) -> Matrix:
+    """
+    한 칸당 1바이트로 나타낸 게임판을 2차원 리스트로 되돌린다.
+    :param packed: TetrisMap.get_map_packed의 반환값
+    :return: int 자료형의 2차원 리스트
+    """
+    width = TetrisMap.width
+    return [list(packed[i:i + width]) for i in range(0, len(packed), width)]
+
+
+def unpack_queue(packed: bytes) -> list[Form]:
+    """
+    색상 구분자로 나타낸 블록 대기 큐를 블록 모양 행렬 리스트로 되돌린다.
+    :param packed: TetrisMap.get_queue_packed의 반환값
+    :return: 블록을 나타내는 행렬을 담은 리스트
+    """
+    return [TetrisBlock.rotations[color][0] for color in packed]
+
+
+def rotate_form(form: Form, clockwise: bool) -> Form:
+    """
+    블록 모양 행렬을 돌린다.
+    :param form: 블록 모양 행렬
+    :param clockwise: 시계 방향이면 True, 아니면 False
+    :return: 돌아간 블록 모양 행렬
+    """
+    if clockwise:
+        return tuple(tuple(form[- 1 - j][i] for j in range(len(form[i]))) for i in range(len(form)))
+    else:
+        return tuple(tuple(form[j][- 1 - i] for j in range(len(form[i]))) for i in range(len(form)))
+
+
+def form_rotations(form: Matrix) -> tuple[Form, Form, Form, Form]:
+    """
+    블록 모양을 시계 방향으로 0, 1, 2, 3번 돌린 모양들을 구한다.
+    :param form: 블록 모양 행렬
+    :return: 돌아간 블록 모양 행렬 4개
+    """
+    result = [tuple(map(tuple, form))]
+    for _ in range(3):
+        result.append(rotate_form(result[-1], True))
+    return result[0], result[1], result[2], result[3]
+
+
+def form_offsets(form: Form) -> tuple[Point, ...]:
+    """
+    블록 모양에서 채워진 칸의 위치를 구한다.
+    :param form: 블록 모양 행렬
+    :return: 채워진 칸의 (행, 열) 튜플
+    """
+    return tuple((i, j) for i, row in enumerate(form) for j, value in enumerate(row) if value)
+
+
 class TetrisBlock:
+    __slots__ = ("pos", "color", "rot", "form", "__positions", "__mask")
+
     general_form: Final[list[Matrix]] = [
         [
             [0],
@@ -336,41 +494,42 @@ class TetrisBlock:
             [0, 0, 0, 0],
         ],
     ]
+    rotations: Final[list[tuple[Form, Form, Form, Form]]] = [form_rotations(form) for form in general_form]  # [색상][회전]
+    offsets: Final[list[tuple[tuple[Point, ...], ...]]] = [tuple(map(form_offsets, forms)) for forms in rotations]
+    # 충돌 비트마스크에서 (x, y) 칸은 (x + mask_pad) * mask_stride + (y + mask_pad) 번째 비트이다.
+    # 회전하다 판 밖으로 조금 나간 블록도 담을 수 있게 사방에 여백을 둔다.
+    mask_pad: Final[int] = 4
+    mask_stride: Final[int] = TetrisMap.width + 2 * mask_pad
 
     def __init__(self,
                  pos: Point,
                  color: int or None = None,
-                 form: Matrix or None = None,
-                 created_time: int or None = None):
+                 rot: int = 0):
         """
         테트리스 블록
         :param pos: 생성 위치
         :param color: 색상 구분자
-        :param form: 블록 위상을 나타내는 행렬
-        :param created_time: 시스템 상의 생성 시간
+        :param rot: 기본 모양에서 시계 방향으로 돌린 횟수
         """
         if color is None:
             color = randrange(1, len(TetrisBlock.general_form))
-        if form is None:
-            form = TetrisBlock.general_form[color]
-        if created_time is None:
-            created_time = monotonic_ns()
         self.pos: Final[Point] = pos
-        self.created_time: Final[int] = created_time
         self.color: Final[int] = color
-        self.form: Final[Matrix] = deepcopy(form)
+        self.rot: Final[int] = rot
+        self.form: Final[Form] = TetrisBlock.rotations[color][rot]  # 모든 블록이 공유하므로 바꾸면 안 된다.
+        # 블록은 바뀌지 않으므로 위치를 미리 구해 둔다.
+        self.__positions: Final[tuple[Point, ...]] = tuple(
+            (pos[0] + i, pos[1] + j) for i, j in TetrisBlock.offsets[color][rot]
+        )
+        pad, stride = TetrisBlock.mask_pad, TetrisBlock.mask_stride
+        self.__mask: Final[int] = sum(1 << ((x + pad) * stride + y + pad) for x, y in self.__positions)
 
-    def get_position(self) -> list[Point]:
+    def get_position(self) -> tuple[Point, ...]:
         """
         블록의 위치를 반환한다.
-        :return: 튜플로 표현된 점이 담긴 길이 4의 리스트
+        :return: 튜플로 표현된 점이 담긴 길이 4의 튜플
         """
-        result = []
-        for i in range(len(self.form)):
-            for j in range(len(self.form[i])):
-                if self.form[i][j]:
-                    result.append((self.pos[0] + i, self.pos[1] + j))
-        return result
+        return self.__positions
 
     def rotate(self, clockwise: bool) -> 'TetrisBlock':
         """
@@ -378,14 +537,8 @@ class TetrisBlock:
         :param clockwise: 시계 방향이면 True, 아니면 False
         :return: 새로운 블록 객체
         """
-        new_form = [[0] * len(self.form[i]) for i in range(len(self.form))]
-        for i in range(len(self.form)):
-            for j in range(len(self.form[i])):
-                if clockwise:
-                    new_form[i][j] = self.form[- 1 - j][i]
-                else:
-                    new_form[i][j] = self.form[j][- 1 - i]
-        return TetrisBlock(self.pos, self.color, new_form, self.created_time)
+        rot = (self.rot + (1 if clockwise else -1)) % 4
+        return TetrisBlock(self.pos, self.color, rot)
 
     def move(self, amount: Point) -> 'TetrisBlock':
         """
@@ -393,23 +546,19 @@ class TetrisBlock:
         :param amount: 블록을 움직일 벡터
         :return: 새로운 블록 객체
         """
-        return TetrisBlock((self.pos[0] + amount[0], self.pos[1] + amount[1]), self.color, self.form, self.created_time)
+        return TetrisBlock((self.pos[0] + amount[0], self.pos[1] + amount[1]), self.color, self.rot)
 
-    def copy(self) -> 'TetrisBlock':
-        """
-        블록을 복사한다.
-        :return: 새로운 블록 객체
-        """
-        return TetrisBlock(self.pos, self.color, self.form)
-
-    def collide(self, other: 'TetrisBlock') -> bool:
+    def collide(self, other: 'TetrisBlock', amount: Point = (0, 0)) -> bool:
         """
         다른 블록과 충돌 중인지를 반환한다.
         :param other: 다른 블록 객체
+        :param amount: 이 블록을 옮겨서 확인할 벡터 (옮긴 위치는 판 안이어야 한다)
         :return: 충돌 중이면 True, 아니면 False를 반환한다.
         """
-        point = self.get_position()
-        return any(map(lambda p: p in point, other.get_position()))
+        shift = amount[0] * TetrisBlock.mask_stride + amount[1]
+        if shift >= 0:
+            return self.__mask << shift & other.__mask != 0
+        return self.__mask >> -shift & other.__mask != 0
 
 
 if __name__ == "__main__":
@@ -438,9 +587,18 @@ if __name__ == "__main__":
         7: pygame.Color(127, 255, 255),
     }
 
+    # 셀 영역 미리 만들기
+    cell_rects = [pygame.Rect(j * w, i * w, w, w) for i in range(TetrisMap.height) for j in range(TetrisMap.width)]
+    edge_rects = [
+        [pygame.Rect(j * w - 2, i * w - 2, w + 4, w + 4) for j in range(TetrisMap.width)]
+        for i in range(TetrisMap.height)
+    ]
+
     tetris = Tetris(*player.keys())
     tetris.start()
     done = False
+    packed: bytes | None = None
+    cells: list[tuple[pygame.Rect, int]] = []  # 채워진 칸의 (영역, 색상)
 
     while not done:
         for event in pygame.event.get():
@@ -460,17 +618,19 @@ if __name__ == "__main__":
                         tetris.superdown(p)
 
         tetris.update()
-        m = tetris.get_map()
+        # 판이 바뀌었을 때만 채워진 칸을 다시 모은다.
+        new_packed = tetris.get_map_packed()
+        if new_packed is not packed:
+            packed = new_packed
+            cells = [(rect, value) for rect, value in zip(cell_rects, packed) if value]
 
         screen.fill(pygame.Color(50, 50, 50))
-        pygame.draw.rect(screen, (0, 0, 0), (0, 0, w * 10, w * 30))
+        screen.fill((0, 0, 0), (0, 0, w * 10, w * 30))
         for p, color in player.items():
             for i, j in tetris.get_position(p):
-                pygame.draw.rect(screen, color[5], (j * w - 2, i * w - 2, w + 4, w + 4))
-        for i in range(len(m)):
-            for j in range(len(m[i])):
-                if m[i][j]:
-                    pygame.draw.rect(screen, block_color[m[i][j]], (j * w, i * w, w, w))
+                screen.fill(color[5], edge_rects[i][j])
+        for rect, value in cells:
+            screen.fill(block_color[value], rect)
         screen.blit(font.render("Score: %d" % tetris.get_score(), True, (255, 255, 255)), (300, 300))
         if tetris.get_state() == 2:
             screen.blit(font.render("Game Over", True, (255, 255, 255)), (300, 350))
@@ -1,10 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import TypeVar, Final
-from src.module.Tetris import Tetris
+from typing import TypeVar, Final, Callable
+from src.module.Tetris import Tetris, unpack_map, unpack_queue
 from src.network.PairSocket import Message, PairServerSocket, PairClientSocket, PS
 from src.network.protocol import TetrisMessageType as Tmt
-from src.util.custom_type import Point, Matrix
-from threading import Lock
+from src.util.custom_type import Point, Matrix, Form
+from time import monotonic_ns
+from threading import Lock, Event, Thread
 
 
 class TetrisInterface(ABC):
@@ -12,10 +13,23 @@ class TetrisInterface(ABC):
         self._socket = socket
         self._lock = Lock()
         self.__opposite: Final[str] = socket.get_opposite()
+        # 마지막으로 풀어 둔 (압축 상태, 푼 결과). 상태가 그대로면 다시 풀지 않는다.
+        self.__unpacked_map: tuple[bytes, Matrix] = (b"", [])
+        self.__unpacked_queue: tuple[bytes, list[Form]] = (b"", [])
 
     def get_name(self) -> str:
         return self._socket.get_name()
 
+    def _unpack_map(self, packed: bytes) -> Matrix:
+        if self.__unpacked_map[0] is not packed:
+            self.__unpacked_map = (packed, unpack_map(packed))
+        return self.__unpacked_map[1]
+
+    def _unpack_queue(self, packed: bytes) -> list[Form]:
+        if self.__unpacked_queue[0] is not packed:
+            self.__unpacked_queue = (packed, unpack_queue(packed))
+        return self.__unpacked_queue[1]
+
     def get_opposite(self) -> str:
         return self.__opposite
 
@@ -40,11 +54,11 @@ class TetrisInterface(ABC):
         pass
 
     @abstractmethod
-    def get_queue(self) -> list[Matrix]:
+    def get_queue(self) -> list[Form]:
         pass
 
     @abstractmethod
-    def get_position(self, player: str) -> list[Point]:
+    def get_position(self, player: str) -> tuple[Point, ...]:
         pass
 
     @abstractmethod
@@ -76,147 +90,204 @@ class TetrisServerInterface(TetrisInterface):
         super().__init__(socket)
         self.__state = 0
         self.__end_flag = False
-        self.__tetris = Tetris(socket.get_name(), self.get_opposite())
+        # 연결된 뒤에는 바뀌지 않으므로 한 번만 읽어 둔다.
+        self.__name: Final[str] = socket.get_name()
+        self.__opposite: Final[str] = self.get_opposite()
+        self.__tetris = Tetris(self.__name, self.__opposite)
+        # 읽기 전용 상태 묶음 (압축된 맵, 점수, 압축된 대기 큐, 플레이어별 위치)
+        # update에서 통째로 바꿔 끼우므로 읽을 때는 잠금이 필요 없다.
+        self.__snapshot: tuple[bytes, int, bytes, dict[str, tuple[Point, ...]]] = (b"", 0, b"", {})
+        self.__take_snapshot()
+        self.__pushed: tuple | None = None  # 마지막으로 클라이언트에 보낸 상태 묶음
+        self.__opposite_ready = Event()  # 클라이언트가 게임 화면으로 넘어왔는지
+        self.__push_seq = 0  # 보낸 상태의 순번 (클라이언트가 순서가 뒤바뀐 상태를 버리기 위함)
+
+        # 요청 종류마다 핸들러를 따로 등록해서 소켓의 핸들러 표가 바로 분기하게 한다.
+        map_type, score_type, queue_type, pos_type, all_type = Tmt.map, Tmt.score, Tmt.queue, Tmt.pos, Tmt.all
+
+        def send_map(msg: Message) -> Message:
+            return map_type, self.__snapshot[0]
+
+        def send_score(msg: Message) -> Message:
+            return score_type, self.__snapshot[1]
+
+        def send_queue(msg: Message) -> Message:
+            return queue_type, self.__snapshot[2]
+
+        def send_pos(msg: Message) -> Message:
+            return pos_type, (msg[1], self.__snapshot[3][msg[1]])
+
+        def send_all(msg: Message) -> Message:
+            return all_type, self.__snapshot  # (압축된 맵, 점수, 압축된 대기 큐, 플레이어별 위치)
+
+        ctrl_map: dict[str, Callable[[str], None]] = {
+            "move_left": self.__tetris.move_left,
+            "move_right": self.__tetris.move_right,
+            "move_down": self.__tetris.move_down,
+            "superdown": self.__tetris.superdown,
+            "rotate": self.__tetris.rotate,
+        }
 
-        def send_data(msg: Message) -> Message:
-            with self._lock:
-                if msg[0] == Tmt.map_req:
-                    return Tmt.map, self.get_map()
-                if msg[0] == Tmt.score_req:
-                    return Tmt.score, self.get_score()
-                if msg[0] == Tmt.queue_req:
-                    return Tmt.queue, self.get_queue()
-                if msg[0] == Tmt.pos_req:
-                    return Tmt.pos, (msg[1], self.get_position(msg[1]))
-                if msg[0] == Tmt.all_req:
-                    return Tmt.all, {
-                        Tmt.map: self.__tetris.get_map(),
-                        Tmt.score: self.__tetris.get_score(),
-                        Tmt.queue: self.__tetris.get_queue(),
-                        Tmt.pos: {
-                            self._socket.get_name(): self.__tetris.get_position(self._socket.get_name()),
-                            self._socket.get_opposite(): self.__tetris.get_position(self._socket.get_opposite()),
-                        }
-                    }
+        get_ctrl, lock, opposite, ctrlkey_r = ctrl_map.get, self._lock, self.__opposite, Tmt.ctrlkey_r
 
         def recv_ctrl(msg: Message) -> Message:
-            for ctrl, callback in [
-                ("move_left", self.__tetris.move_left),
-                ("move_right", self.__tetris.move_right),
-                ("move_down", self.__tetris.move_down),
-                ("superdown", self.__tetris.superdown),
-                ("rotate", self.__tetris.rotate),
-            ]:
-                if msg[1] == ctrl:
-                    with self._lock:
-                        callback(self.get_opposite())
-                    return Tmt.ctrlkey_r, None
-
-        self._socket.enroll(Tmt.map_req, send_data)
-        self._socket.enroll(Tmt.score_req, send_data)
-        self._socket.enroll(Tmt.queue_req, send_data)
-        self._socket.enroll(Tmt.pos_req, send_data)
+            with lock:
+                for ctrl in msg[1]:  # 클라이언트가 모아 보낸 조작을 순서대로 처리한다.
+                    callback = get_ctrl(ctrl)
+                    if callback is not None:
+                        callback(opposite)
+                self.__take_snapshot()
+            return ctrlkey_r, None
+
+        def mode_changed(msg: Message) -> None:
+            self.__opposite_ready.set()  # 클라이언트가 알려주기만 하는 메시지이므로 응답하지 않는다.
+
+        self._socket.enroll(Tmt.mdchngd, mode_changed)
+        self._socket.enroll(Tmt.map_req, send_map)
+        self._socket.enroll(Tmt.score_req, send_score)
+        self._socket.enroll(Tmt.queue_req, send_queue)
+        self._socket.enroll(Tmt.pos_req, send_pos)
         self._socket.enroll(Tmt.ctrlkey, recv_ctrl)
-        self._socket.enroll(Tmt.all_req, send_data)
+        self._socket.enroll(Tmt.all_req, send_all)
 
     def start(self) -> None:
         with self._lock:
             self.__tetris.start()
-        while not self._socket.request((Tmt.mdchngd, None), Tmt.mdchngd_r)[1]:
-            continue
-        self._socket.request((Tmt.start, None), Tmt.start_r)
+        # 클라이언트가 아직 로비에 있으면 게임 화면으로 넘어왔다고 알려줄 때까지 기다린다.
+        if not self._socket.request((Tmt.mdchngd, None), Tmt.mdchngd_r)[1]:
+            self.__opposite_ready.wait()
+        # 시작 메시지에 첫 상태를 담아서 클라이언트가 시작 전에 상태를 받아두게 한다.
+        self._socket.request((Tmt.start, self.__next_state()), Tmt.start_r)
 
     def update(self) -> None:
-        with self._lock:
-            self.__tetris.update()
-            self.__state = self.__tetris.get_state()
-            if self.__state == 2 and not self.__end_flag:
-                self.__end_flag = True
-                self._socket.request((Tmt.ended, None), Tmt.ended_r)
+        # 블록이 내려갈 시간이 아니면 잠금을 잡지 않는다. (조작에 의한 변화는 조작할 때 반영한다.)
+        if monotonic_ns() >= self.__tetris.get_next_update_ns():
+            with self._lock:
+                self.__tetris.update()
+                self.__take_snapshot()
+        if self.__snapshot != self.__pushed:
+            self.__push()
+        if self.__state == 2 and not self.__end_flag:
+            self.__end_flag = True
+            self._socket.send((Tmt.ended, None))
 
     def get_state(self) -> int:
         return self.__state
 
     def get_map(self) -> Matrix:
-        with self._lock:
-            return self.__tetris.get_map()
+        return self._unpack_map(self.__snapshot[0])
 
     def get_score(self) -> int:
-        with self._lock:
-            return self.__tetris.get_score()
+        return self.__snapshot[1]
 
-    def get_queue(self) -> list[Matrix]:
-        with self._lock:
-            return self.__tetris.get_queue()
+    def get_queue(self) -> list[Form]:
+        return self._unpack_queue(self.__snapshot[2])
 
-    def get_position(self, player: str) -> list[Point]:
-        with self._lock:
-            return self.__tetris.get_position(player)
+    def get_position(self, player: str) -> tuple[Point, ...]:
+        return self.__snapshot[3][player]
 
     def move_left(self) -> None:
         with self._lock:
-            self.__tetris.move_left(self._socket.get_name())
+            self.__tetris.move_left(self.__name)
+            self.__take_snapshot()
 
     def move_right(self) -> None:
         with self._lock:
-            self.__tetris.move_right(self._socket.get_name())
+            self.__tetris.move_right(self.__name)
+            self.__take_snapshot()
 
     def move_down(self) -> None:
         with self._lock:
-            self.__tetris.move_down(self._socket.get_name())
+            self.__tetris.move_down(self.__name)
+            self.__take_snapshot()
 
     def superdown(self) -> None:
         with self._lock:
-            self.__tetris.superdown(self._socket.get_name())
+            self.__tetris.superdown(self.__name)
+            self.__take_snapshot()
 
     def rotate(self) -> None:
         with self._lock:
-            self.__tetris.rotate(self._socket.get_name())
+            self.__tetris.rotate(self.__name)
+            self.__take_snapshot()
+
+    def __push(self) -> None:
+        # 현재 상태 묶음을 클라이언트에 보낸다. (응답은 오지 않는다.)
+        self._socket.send((Tmt.state, self.__next_state()))
+
+    def __next_state(self) -> tuple:
+        # 현재 상태 묶음에 순번을 붙인다.
+        self.__pushed = self.__snapshot
+        self.__push_seq += 1
+        return self.__push_seq, *self.__pushed
+
+    def __take_snapshot(self) -> None:
+        # 잠금을 잡은 상태(또는 생성 중)에서만 호출한다.
+        self.__state = self.__tetris.get_state()
+        packed_map = self.__tetris.get_map_packed()
+        if packed_map is self.__snapshot[0]:  # 판이 그대로면 점수, 대기 큐, 위치도 그대로다.
+            return
+        self.__snapshot = (
+            packed_map,
+            self.__tetris.get_score(),
+            self.__tetris.get_queue_packed(),
+            {
+                self.__name: self.__tetris.get_position(self.__name),
+                self.__opposite: self.__tetris.get_position(self.__opposite),
+            },
+        )
 
 
 class TetrisClientInterface(TetrisInterface):
     def __init__(self, socket: PairClientSocket):
         super().__init__(socket)
-        self.__map: Matrix = []
-        self.__score: int = 0
-        self.__player_pos: dict[str, list[Point]] = {
-            self._socket.get_name(): [],
-            self.get_opposite(): [],
-        }
-        self.__queue: list[Matrix] = []
-        self.__started = False
+        # 서버가 보내준 상태 묶음 (압축된 맵, 점수, 압축된 대기 큐, 플레이어별 위치)
+        # 받을 때 통째로 바꿔 끼우므로 읽는 쪽에서 섞인 상태를 보지 않는다.
+        self.__snapshot: tuple[bytes, int, bytes, dict[str, tuple[Point, ...]]] = (
+            b"", 0, b"", {self._socket.get_name(): (), self.get_opposite(): ()}
+        )
+        self.__state_seq = 0  # 마지막으로 받은 상태의 순번
+        self.__pending_ctrls: list[str] = []  # 아직 서버에 보내지 않은 조작
+        self.__sending_ctrls = False  # 조작을 보내는 스레드가 돌고 있는지
+        self.__started = Event()
         self.__ended = False
 
         def ready(msg: Message) -> Message:
             return Tmt.mdchngd_r, True
 
-        def recv_gamestate(msg: Message) -> Message:
+        def apply_state(state: tuple) -> None:
+            seq, tetris_map, score, queue, positions = state
+            with self._lock:
+                if seq > self.__state_seq:  # 늦게 도착한 이전 상태는 버린다.
+                    self.__state_seq = seq
+                    self.__snapshot = (tetris_map, score, queue, positions)
+
+        def recv_gamestate(msg: Message) -> Message | None:
             if msg[0] == Tmt.start:
-                self.__started = True
+                apply_state(msg[1])  # 시작 메시지에는 첫 상태가 담겨 있다.
+                self.__started.set()
                 return Tmt.start_r, None
             elif msg[0] == Tmt.ended:
-                self.__ended = True
-                return Tmt.ended_r, None
+                self.__ended = True  # 서버가 보내기만 하는 메시지이므로 응답하지 않는다.
+
+        def recv_state(msg: Message) -> None:
+            apply_state(msg[1])  # 서버가 보내기만 하는 메시지이므로 응답하지 않는다.
 
         self._socket.enroll(Tmt.start, recv_gamestate)
         self._socket.enroll(Tmt.ended, recv_gamestate)
         self._socket.enroll(Tmt.mdchngd, ready)
+        self._socket.enroll(Tmt.state, recv_state)
+        self._socket.send((Tmt.mdchngd, True))  # 서버가 먼저 물어봤다면 기다리고 있다.
 
     def start(self) -> None:
-        while True:
-            if self.__started:
-                break
-        self.update()
+        self.__started.wait()
 
     def update(self) -> None:
-        response = self._socket.request((Tmt.all_req, None), Tmt.all)[1]
-        self.__map = response[Tmt.map]
-        self.__score = response[Tmt.score]
-        self.__queue = response[Tmt.queue]
-        self.__player_pos = response[Tmt.pos]
+        # 상태는 바뀔 때마다 서버가 보내준다.
+        pass
 
     def get_state(self) -> int:
-        if not self.__started:
+        if not self.__started.is_set():
             return 0
         elif not self.__ended:
             return 1
@@ -224,28 +295,48 @@ class TetrisClientInterface(TetrisInterface):
             return 2
 
     def get_map(self) -> Matrix:
-        return self.__map
+        return self._unpack_map(self.__snapshot[0])
 
     def get_score(self) -> int:
-        return self.__score
+        return self.__snapshot[1]
 
-    def get_queue(self) -> list[Matrix]:
-        return self.__queue
+    def get_queue(self) -> list[Form]:
+        return self._unpack_queue(self.__snapshot[2])
 
-    def get_position(self, player: str) -> list[Point]:
-        return self.__player_pos[player]
+    def get_position(self, player: str) -> tuple[Point, ...]:
+        return self.__snapshot[3][player]
 
     def move_left(self) -> None:
-        self._socket.request((Tmt.ctrlkey, "move_left"), Tmt.ctrlkey_r)
+        self.__send_ctrl("move_left")
 
     def move_right(self) -> None:
-        self._socket.request((Tmt.ctrlkey, "move_right"), Tmt.ctrlkey_r)
+        self.__send_ctrl("move_right")
 
     def move_down(self) -> None:
-        self._socket.request((Tmt.ctrlkey, "move_down"), Tmt.ctrlkey_r)
+        self.__send_ctrl("move_down")
 
     def superdown(self) -> None:
-        self._socket.request((Tmt.ctrlkey, "superdown"), Tmt.ctrlkey_r)
+        self.__send_ctrl("superdown")
 
     def rotate(self) -> None:
-        self._socket.request((Tmt.ctrlkey, "rotate"), Tmt.ctrlkey_r)
+        self.__send_ctrl("rotate")
+
+    def __send_ctrl(self, ctrl: str) -> None:
+        # 조작을 쌓아 두고, 보내는 스레드가 없으면 하나 띄운다.
+        with self._lock:
+            self.__pending_ctrls.append(ctrl)
+            if self.__sending_ctrls:
+                return
+            self.__sending_ctrls = True
+        Thread(target=self.__flush_ctrls, daemon=True).start()
+
+    def __flush_ctrls(self) -> None:
+        # 응답을 기다리는 동안 쌓인 조작은 다음 요청 하나로 모아 보낸다. (한 번에 하나씩 보내서 순서를 지킨다.)
+        while True:
+            with self._lock:
+                ctrls = tuple(self.__pending_ctrls)
+                self.__pending_ctrls.clear()
+                if not ctrls:
+                    self.__sending_ctrls = False
+                    return
+            self._socket.request((Tmt.ctrlkey, ctrls), Tmt.ctrlkey_r)
@@ -1,8 +1,9 @@
 import socket
 from abc import ABC, abstractmethod
 from enum import IntEnum, unique
-from pickle import dumps, loads
-from threading import Thread, Lock, Semaphore
+from io import BytesIO
+from pickle import dumps, load, UnpicklingError
+from threading import Thread, Lock, Semaphore, Condition
 from typing import Type, Callable, TypeVar, Final
 
 
@@ -11,6 +12,7 @@ class MessageType(IntEnum):
     """
     메시지의 타입을 정의한 열거형
     메시지 타입은 반드시 요청과 응답 쌍을 가지고 있어야 한다.
+    단, 핸들러가 None을 반환하는 요청은 보내기만 하는 메시지로 응답을 보내지 않는다.
     """
     pass
 
@@ -19,6 +21,30 @@ MT = TypeVar("MT", bound=MessageType)
 MTI = MT | int
 Message = tuple[MTI, any]  # 메시지의 정의
 
+encoded_messages: dict[Message, bytes] = {}  # 내용이 없는 메시지의 직렬화 결과
+max_message_size: Final[int] = 2 ** 20  # 이보다 많이 쌓였는데도 읽지 못하면 깨진 메시지로 본다.
+
+
+class ProtocolError(Exception):
+    """
+    상대가 메시지 형식에 맞지 않는 데이터를 보냈을 때 발생하는 예외
+    """
+    pass
+
+
+def encode(msg: Message) -> bytes:
+    """
+    메시지를 직렬화한다. 내용이 없는 메시지는 한 번만 직렬화해서 재사용한다.
+    :param msg: 메시지 객체
+    :return: 직렬화된 메시지
+    """
+    if msg[1] is not None:
+        return dumps(msg)
+    packet = encoded_messages.get(msg)
+    if packet is None:
+        packet = encoded_messages[msg] = dumps(msg)
+    return packet
+
 
 class PairSocket(ABC):
     def __init__(self, name: str, on_disconnected: Callable[[], None] | None = None):
@@ -28,9 +54,12 @@ class PairSocket(ABC):
         self._name: Final[str] = name
         self._opposite_name: str | None = None
         self._socket: socket.socket | None = None
-        self._handler_map: dict[MTI, Callable[[Message], Message]] = {}
+        self._handler_map: dict[MTI, Callable[[Message], Message | None]] = {}
         self._lock = Lock()
         self.__response: dict[MTI, Message] = {}
+        self.__response_ready = Condition(self._lock)
+        self.__outbox: list[bytes] = []  # 보낼 메시지들 (소켓에는 전송 스레드만 쓴다)
+        self.__outbox_ready = Condition(self._lock)
 
         def introduce(msg: Message) -> Message:
             self._opposite_name = msg[1]
@@ -38,36 +67,73 @@ class PairSocket(ABC):
 
         self._handler_map[-1] = introduce
 
+        def writer(sock: socket.socket) -> None:
+            # 쌓인 메시지를 한 번에 이어서 보낸다.
+            # 보내는 동안에는 잠금을 놓는다. (상대도 보내느라 막혀 있을 때 이쪽이 받지 못하면 서로 멈춘다.)
+            while True:
+                with self._lock:
+                    while not self.__outbox and self._socket is sock:
+                        self.__outbox_ready.wait()
+                    if self._socket is not sock:
+                        return
+                    packet = b"".join(self.__outbox)
+                    self.__outbox.clear()
+                try:
+                    sock.sendall(packet)
+                except OSError:
+                    return
+
         def message_handler() -> None:
             with self._lock:
-                self._socket.send(dumps((-1, self._name)))
+                self.__outbox.append(dumps((-1, self._name)))
+                Thread(target=writer, args=(self._socket,), daemon=True).start()
+
+            def send_thread(h: Callable[[Message], Message | None], msg: Message) -> None:
+                response = h(msg)
+                if response is None:  # 보내기만 하는 메시지
+                    return
+                self.send(response)
+
             try:
+                recv, get_handler, responses = self._socket.recv, self._handler_map.get, self.__response
+                buffer = b""
                 while True:
-                    packet = self._socket.recv(4096)
+                    packet = recv(4096)
                     if len(packet) == 0:
                         break
-                    msg: Message = loads(packet)
-                    handler: Callable[[Message], Message] | None = None
-                    with self._lock:
-                        if msg[0] in self._handler_map:  # 요청 메시지일 시
-                            handler = self._handler_map[msg[0]]
-                        else:  # 응답 메시지일 시
-                            self.__response[msg[0]] = msg
-                    if handler is not None:
-
-                        def send_thread(h: Callable[[Message], Message]) -> None:
-                            response = h(msg)
-                            with self._lock:
-                                self._socket.send(dumps(response))
-
-                        Thread(target=send_thread, args=(handler,), daemon=True).start()
-            except OSError:
+                    # 한 번에 여러 메시지가 오거나 메시지가 잘려서 올 수 있다.
+                    buffer += packet
+                    stream = BytesIO(buffer)
+                    while True:
+                        start = stream.tell()
+                        try:
+                            msg: Message = load(stream)
+                        except (EOFError, UnpicklingError) as e:  # 아직 다 받지 못한 메시지
+                            if len(buffer) - start > max_message_size:  # 깨진 메시지이므로 연결을 끊는다.
+                                raise ProtocolError() from e
+                            break
+                        except Exception as e:  # 읽을 수 없는 데이터
+                            raise ProtocolError() from e
+                        if not (isinstance(msg, tuple) and len(msg) == 2 and isinstance(msg[0], int)):
+                            raise ProtocolError()
+                        with self._lock:
+                            handler: Callable[[Message], Message | None] | None = get_handler(msg[0])  # 요청 메시지일 시
+                            if handler is None:  # 응답 메시지일 시
+                                responses[msg[0]] = msg
+                                self.__response_ready.notify_all()
+                        if handler is not None:
+                            Thread(target=send_thread, args=(handler, msg), daemon=True).start()
+                    buffer = buffer[start:]
+            except (OSError, ProtocolError):  # 연결이 끊겼거나 깨진 메시지를 받았다.
                 pass
             finally:
                 with self._lock:
                     self._socket.close()
                     self._socket = None
                     self._opposite_name = None
+                    self.__outbox.clear()
+                    self.__outbox_ready.notify_all()
+                    self.__response_ready.notify_all()
                 if on_disconnected is not None:
                     on_disconnected()
 
@@ -109,23 +175,38 @@ class PairSocket(ABC):
         메시지를 보내고 응답을 받은 뒤 반환한다.
         :param msg: 메시지 객체
         :param response_type: 응답 형식
-        :return: 응답 메시지 객체
+        :return: 응답 메시지 객체, 응답을 받기 전에 연결이 끊기면 None을 반환한다.
         """
-        try:
-            with self._lock:
-                self._socket.send(dumps(msg))
-            while True:
-                with self._lock:
-                    if response_type in self.__response:
-                        return self.__response.pop(response_type)
-        except (OSError, AttributeError):
-            return None
+        with self._lock:
+            sock = self._socket
+            if sock is None:
+                return None
+            self.__response.pop(response_type, None)  # 이전에 받고 읽지 않은 응답은 버린다.
+            self.__outbox.append(encode(msg))
+            self.__outbox_ready.notify()
+            while response_type not in self.__response:
+                if self._socket is not sock:
+                    return None
+                self.__response_ready.wait()
+            return self.__response.pop(response_type)
+
+    def send(self, msg: Message) -> None:
+        """
+        메시지를 보내고 응답을 기다리지 않는다.
+        메시지는 쌓아 두었다가 전송 스레드가 한 번에 이어서 보낸다.
+        :param msg: 메시지 객체
+        """
+        with self._lock:
+            if self._socket is None:
+                return
+            self.__outbox.append(encode(msg))
+            self.__outbox_ready.notify()
 
-    def enroll(self, msgtype: Type[MTI], handler: Callable[[Message], Message]) -> None:
+    def enroll(self, msgtype: Type[MTI], handler: Callable[[Message], Message | None]) -> None:
         """
         메시지 핸들러를 등록한다.
         :param msgtype: 메시지 타입
-        :param handler: 핸들러 함수
+        :param handler: 핸들러 함수 (None을 반환하면 응답을 보내지 않는다)
         """
         with self._lock:
             self._handler_map[msgtype] = handler
@@ -159,6 +240,7 @@ class PairClientSocket(PairSocket):
                 sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2 ** 20)
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 ** 20)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 sock.settimeout(1)
                 sock.connect((ip, port))
                 sock.settimeout(None)
@@ -204,6 +286,7 @@ class PairServerSocket(PairSocket):
                 sock, _ = listner.accept()
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 2 ** 20)
                 sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 2 ** 20)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 sock.settimeout(None)
                 self._socket = sock
                 self._message_handler()
@@ -242,4 +325,31 @@ if __name__ == "__main__":
 
     m = c.request((TetrisMessageType.chat, "hello"), TetrisMessageType.chat_r)
     print("server gets: " + m[1])
+
+    # 깨진 메시지를 받은 서버가 연결만 끊고 다음 접속을 계속 받는지 확인한다.
+    s2 = PairServerSocket("server2")
+    s2.start("127.0.0.1", tetris_port + 1)
+    s2.enroll(TetrisMessageType.chat, echo)
+    for corrupt in (dumps(1), b"\x80\x04\xff" + b"\x00" * (max_message_size + 4096)):
+        while True:
+            try:
+                raw = socket.create_connection(("127.0.0.1", tetris_port + 1))
+                break
+            except OSError:  # 서버가 아직 열리지 않았다.
+                continue
+        try:
+            raw.sendall(dumps((-1, "raw")) + corrupt)
+            while raw.recv(4096):  # 서버가 끊을 때까지 받는다.
+                continue
+        except OSError:  # 서버가 먼저 끊을 수 있다.
+            pass
+        raw.close()
+        print("Corrupt message dropped.")
+
+    c2 = PairClientSocket("client2")
+    c2.start("127.0.0.1", tetris_port + 1)
+    while None in (c2.get_opposite(), s2.get_opposite()):
+        continue
+    m = c2.request((TetrisMessageType.chat, "again"), TetrisMessageType.chat_r)
+    print("server2 gets: " + m[1])
     print("Test clear.")
@@ -1,57 +1,40 @@
+import errno
+import selectors
 import socket
 import struct
+from io import BytesIO
 from threading import Thread, Lock, Semaphore
+from typing import Callable, Iterable
 import netifaces
-from time import sleep
-from pickle import dumps, loads
+from time import monotonic
+from pickle import dumps, load
+
+# 논블로킹 connect_ex가 연결 중일 때 돌려주는 값
+connecting_errors = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, getattr(errno, "WSAEWOULDBLOCK", 0)}
 
 
 class ServerScanner:
-    class ServerScanThread(Thread):
-        def __init__(self, ip: int | str, port: int, timeout: float = 1):
-            """
-            로컬 네트워크 서버 스캔 스레드
-            :param ip: IP 주소
-            :param port: 포트 번호
-            """
-            Thread.__init__(self, daemon=True)
-            if type(ip) is int:
-                ip = socket.inet_ntoa(struct.pack('!I', ip))
-            self.ip: str = ip
-            self.port = port
-            self.result: tuple[str, int, str] | None = None
-            self.timeout = timeout
-
-        def run(self):
-            try:
-                client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                client_socket.settimeout(self.timeout)
-                client_socket.connect((self.ip, self.port))
-                client_socket.send(dumps((-1, "scanner")))
-                while True:
-                    msg = loads(client_socket.recv(1024))
-                    if msg[0] == -2:
-                        self.result = (self.ip, self.port, msg[1])
-                        break
-                client_socket.close()
-            except OSError:
-                pass
-
-        def join(self, *args, **kwargs) -> tuple[str, int, str] | None:
-            super().join(*args, **kwargs)
-            return self.result
-
-    def __init__(self):
+    def __init__(self, timeout: float = 1, max_sockets: int = 256):
         """
         서버 스캐너
+        :param timeout: 한 주소마다 접속과 응답을 기다리는 시간
+        :param max_sockets: 동시에 접속을 시도할 주소의 최대 개수
         """
+        self.timeout = timeout
+        self.max_sockets = max_sockets
         self.__scanning = False
         self.__server_list: list[tuple[str, int, str]] | None = []  # IP, port, 이름
         self.__lock = Lock()
 
-    def scan(self, port: int, sem: Semaphore | None = None) -> None:
+    def scan(self,
+             port: int,
+             sem: Semaphore | None = None,
+             on_complete: Callable[[list[tuple[str, int, str]]], None] | None = None) -> None:
         """
         비동기적으로 스캔을 수행한다.
+        :param port: 포트 번호
+        :param sem: 스캔 시작을 기다리기 위한 잠금
+        :param on_complete: 스캔이 끝나면 (IP 주소, 포트 번호, 이름) 목록을 받아 스캔 스레드에서 호출된다.
         """
         with self.__lock:
             scanning = self.__scanning
@@ -64,17 +47,13 @@ class ServerScanner:
             sem.release()
 
         def scanning() -> None:
-            threads: list[ServerScanner.ServerScanThread] = []
-            for prefix, mask in get_iface_list():
-                for i in range(2, (1 << 32) - 1 & ~mask):
-                    ip = prefix + i
-                    thread = self.ServerScanThread(ip, port)
-                    threads.append(thread)
-                    thread.start()
-            server_list = list(filter(lambda x: x is not None, [thread.join() for thread in threads]))
+            ips = (prefix + i for prefix, mask in get_iface_list() for i in range(2, (1 << 32) - 1 & ~mask))
+            server_list = scan_addresses(ips, port, self.timeout, self.max_sockets)
             with self.__lock:
                 self.__server_list = server_list.copy()
                 self.__scanning = False
+            if on_complete is not None:
+                on_complete(server_list)
 
         Thread(target=scanning, daemon=True).start()
 
@@ -83,7 +62,6 @@ class ServerScanner:
         스캔된 서버 IP 주소 현황을 반환한다.
         :return: (IP 주소, 포트 번호, 이름) 튜플들이 담긴 튜플을 반환하며, 스캔 중일 경우 None을 반환한다.
         """
-        sleep(0)
         with self.__lock:
             if self.__server_list is None:
                 return None
@@ -95,11 +73,98 @@ class ServerScanner:
         서버를 스캔 중인지를 반환한다.
         :return: 스캔 중이면 True, 그렇지 않으면 False를 반환한다.
         """
-        sleep(0)
         with self.__lock:
             return self.__scanning
 
 
+def scan_addresses(ips: Iterable[int], port: int, timeout: float, max_sockets: int) -> list[tuple[str, int, str]]:
+    """
+    여러 주소에 한꺼번에 논블로킹으로 접속해서 서버를 찾는다.
+    동시에 여는 소켓 수를 넘지 않는 선에서 끝난 주소의 자리에 바로 다음 주소를 넣는다.
+    :param ips: 정수 자료형의 IP 주소들
+    :param port: 포트 번호
+    :param timeout: 한 주소마다 접속과 응답을 기다리는 시간
+    :param max_sockets: 동시에 열어 둘 소켓의 최대 개수
+    :return: 찾은 서버의 (IP 주소, 포트 번호, 이름)이 담긴 리스트
+    """
+    result = []
+    pending = iter(ips)
+    deadlines: dict[socket.socket, float] = {}  # 기다리는 시간이 모두 같으므로 넣은 순서가 곧 마감 순서이다.
+    buffers: dict[socket.socket, bytes] = {}
+    with selectors.DefaultSelector() as selector:
+
+        def close(sock: socket.socket) -> None:
+            selector.unregister(sock)
+            del deadlines[sock]
+            buffers.pop(sock, None)
+            sock.close()
+
+        def open_more() -> None:
+            while len(deadlines) < max_sockets:
+                ip = next(pending, None)
+                if ip is None:
+                    return
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                ip = socket.inet_ntoa(struct.pack('!I', ip))
+                if sock.connect_ex((ip, port)) not in connecting_errors:
+                    sock.close()
+                    continue
+                selector.register(sock, selectors.EVENT_WRITE, ip)
+                deadlines[sock] = monotonic() + timeout
+
+        open_more()
+        while deadlines:
+            # 마감이 지난 주소는 포기하고 그 자리를 다음 주소에 넘긴다.
+            now = monotonic()
+            for sock, deadline in list(deadlines.items()):
+                if deadline > now:
+                    break
+                close(sock)
+            open_more()
+            if not deadlines:
+                break
+            for key, events in selector.select(next(iter(deadlines.values())) - now):
+                sock: socket.socket = key.fileobj
+                try:
+                    if events & selectors.EVENT_WRITE:  # 접속 완료 또는 실패
+                        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+                            close(sock)
+                            continue
+                        sock.send(dumps((-1, "scanner")))
+                        buffers[sock] = b""
+                        selector.modify(sock, selectors.EVENT_READ, key.data)
+                    else:  # 응답 수신
+                        packet = sock.recv(1024)
+                        if len(packet) == 0:
+                            close(sock)
+                            continue
+                        buffers[sock] += packet
+                        name = read_name(buffers[sock])
+                        if name is not None:
+                            result.append((key.data, port, name))
+                            close(sock)
+                except OSError:
+                    close(sock)
+    return result
+
+
+def read_name(buffer: bytes) -> str | None:
+    """
+    받은 데이터에서 서버의 소개 응답을 찾아 이름을 꺼낸다.
+    :param buffer: 지금까지 받은 데이터
+    :return: 응답을 찾으면 서버 이름을, 그렇지 않으면 None을 반환한다.
+    """
+    stream = BytesIO(buffer)
+    while True:
+        try:
+            msg = load(stream)
+            if msg[0] == -2:
+                return msg[1]
+        except Exception:  # 아직 다 받지 못했거나 알 수 없는 데이터
+            return None
+
+
 def get_iface_list() -> list[tuple[int, int]]:
     """
     현재 기기의 네트워크 인터페이스마다 네트워크 주소 접두사, 서브넷 마스크를 구한다.
@@ -20,9 +20,9 @@ class TetrisMessageType(MessageType):
     mdchngd = auto()  # 모드 변경
     mdchngd_r = auto()
 
-    start = auto()  # 게임 시작
+    start = auto()  # 게임 시작 (내용은 첫 게임 상태)
     start_r = auto()
-    ended = auto()  # 게임 종료
+    ended = auto()  # 게임 종료 (응답 없음)
     ended_r = auto()
 
     map_req = auto()  # 게임 맵 요청
@@ -34,8 +34,11 @@ class TetrisMessageType(MessageType):
     pos_req = auto()  # 플레이어 블록 좌표 요청
     pos = auto()
 
-    all_req = auto()  # 게임의 모든 데이터 요청 (experimental)
+    all_req = auto()  # 게임의 모든 데이터 요청 (experimental), 응답은 (맵, 점수, 대기 큐, 위치) 튜플
     all = auto()
 
-    ctrlkey = auto()  # 게임 조작키
+    ctrlkey = auto()  # 게임 조작키 (조작 이름들의 튜플)
     ctrlkey_r = auto()
+
+    state = auto()  # 바뀐 게임 상태 전달 (서버 -> 클라이언트, 응답 없음)
+    state_r = auto()
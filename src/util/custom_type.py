@@ -1,2 +1,3 @@
 Point = tuple[int, int]
-Matrix = list[list[int]]
\ No newline at end of file
+Matrix = list[list[int]]
+Form = tuple[tuple[int, ...], ...]  # 바뀌지 않는 블록 모양 행렬
@@ -0,0 +1,20 @@
+from time import monotonic_ns, sleep
+
+import pygame
+
+
+def wait_frame(next_tick: int, frame_ns: int) -> int:
+    """
+    다음 프레임 시각까지 이벤트를 받으면서 기다린다.
+    :param next_tick: 나노초 단위의 다음 프레임 시각
+    :param frame_ns: 나노초 단위의 프레임 간격
+    :return: 그 다음 프레임 시각
+    """
+    while (remaining := next_tick - monotonic_ns()) > 0:
+        if remaining > 2_000_000:
+            sleep(0.001)
+        else:
+            sleep(0)
+        pygame.event.pump()
+    # 프레임이 밀렸을 때는 따라잡지 않고 지금부터 한 프레임 뒤를 다음 시각으로 잡는다.
+    return max(next_tick + frame_ns, monotonic_ns() + frame_ns)
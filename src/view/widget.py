@@ -7,24 +7,33 @@ from src.util.custom_type import Point
 
 
 class Drawable(ABC):
-    drawables: set['Drawable'] = set()
+    drawables: list['Drawable'] = []
 
     @staticmethod
     def spread_draw(screen: pygame.Surface) -> None:
-        for drawable in Drawable.drawables.copy():
+        for drawable in Drawable.drawables[:]:
             if drawable._drawable:
                 drawable.draw(screen)
 
     def __init__(self):
         self._drawable = False
-        Drawable.drawables.add(self)
+        self._drawable_index: int | None = len(Drawable.drawables)  # drawables 안에서의 위치 (지워지면 None)
+        Drawable.drawables.append(self)
 
     def activate(self) -> None:
         self._drawable = True
 
     def kill(self) -> None:
         self._drawable = False
-        Drawable.drawables.remove(self)
+        index = self._drawable_index
+        if index is None:  # 이미 지워졌다.
+            return
+        self._drawable_index = None
+        # 그리는 순서가 곧 겹치는 순서이므로 순서를 지킨 채 지우고 뒤쪽 위치만 고친다.
+        drawables = Drawable.drawables
+        del drawables[index]
+        for i in range(index, len(drawables)):
+            drawables[i]._drawable_index = i
 
     @abstractmethod
     def draw(self, screen: pygame.Surface) -> None:
@@ -32,11 +41,11 @@ class Drawable(ABC):
 
 
 class Clickable(ABC):
-    clickables: set['Clickable'] = set()
+    clickables: list['Clickable'] = []
 
     @staticmethod
     def spread_click(mouse: Point) -> None:
-        for clickable in Clickable.clickables.copy():
+        for clickable in Clickable.clickables[:]:
             if clickable._clickable and clickable.rect.collidepoint(*mouse):
                 clickable.click()
 
@@ -44,14 +53,23 @@ class Clickable(ABC):
         self._clickable = False
         self.callback = callback
         self.rect = pygame.rect.Rect(*point, *size)
-        Clickable.clickables.add(self)
+        self._clickable_index: int | None = len(Clickable.clickables)  # clickables 안에서의 위치 (지워지면 None)
+        Clickable.clickables.append(self)
 
     def activate(self) -> None:
         self._clickable = True
 
     def kill(self) -> None:
         self._clickable = False
-        Clickable.clickables.remove(self)
+        index = self._clickable_index
+        if index is None:  # 이미 지워졌다.
+            return
+        self._clickable_index = None
+        # 클릭을 받는 순서는 상관없으므로 마지막 원소를 빈자리로 옮겨서 지운다.
+        last = Clickable.clickables.pop()
+        if last is not self:
+            Clickable.clickables[index] = last
+            last._clickable_index = index
 
     def click(self) -> None:
         self.callback()